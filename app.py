@@ -2,8 +2,11 @@
 import io
 import re
 import csv
+import itertools
+import time
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional
+from typing import Iterator, List, Dict, Tuple, Optional
 
 import streamlit as st
 from pathlib import Path
@@ -15,32 +18,58 @@ PROMPTS_PATH = Path("data/original.csv")          # col1=index, col2=model, col3
 COMPARISONS_PATH = Path("data/llama_outputs_summary.csv")  # TXT with "RANDOMIZED ORDER..." or CSV with a_model/a_index/b_model/b_index
 PROGRESS_PATH: Optional[Path] = None             # e.g., Path("data/progress.csv") to resume; or leave None
 AUTOSAVE_PATH: Optional[Path] = None             # e.g., Path("data/progress_autosave.csv")
+AUTOSAVE_EVERY = 10                              # autosave after this many choices...
+AUTOSAVE_INTERVAL_S = 5.0                        # ...or once this many seconds passed since the last write
 
 # -------- Parsers & helpers -------- #
 PAIR_PATTERN = re.compile(
     r"RANDOMIZED ORDER:\s*A:\s*(?P<a_model>[A-Za-z0-9_\-]+)\[(?P<a_idx>\d+)\]\s*,\s*B:\s*(?P<b_model>[A-Za-z0-9_\-]+)\[(?P<b_idx>\d+)\]",
     re.IGNORECASE,
 )
+_MODEL_IDX_RE = re.compile(r"([^[]+)\[(\d+)\]")
+
+@dataclass(slots=True)
+class Pair:
+    pair_id: int
+    a_model: str
+    a_idx: int
+    b_model: str
+    b_idx: int
+    a_prompt: Optional[str] = None  # filled from the comparisons CSV summary or the prompts CSV
+    b_prompt: Optional[str] = None
+
+@dataclass(slots=True)
+class Progress:
+    pair_id: Optional[int]
+    a_model: str
+    a_index: int
+    b_model: str
+    b_index: int
+    choice: str = ""  # "A", "B" or empty when unanswered
+    timestamp: str = ""
+
+_NORM_TRANS = str.maketrans("", "", " -_")
 
 def normalize_header(name: str) -> str:
-    return name.strip().lower().replace(" ", "").replace("-", "").replace("_", "")
+    return name.strip().lower().translate(_NORM_TRANS)
 
 def read_text(p: Path) -> str:
     return p.read_text(encoding="utf-8", errors="replace")
 
-def load_prompt_csv_from_text(text: str) -> Dict[Tuple[str, int], str]:
-    reader = csv.reader(io.StringIO(text))
-    rows = list(reader)
-    if not rows:
+# model -> index -> summary; each model name is stored once instead of in every key
+PromptMap = Dict[str, Dict[int, str]]
+
+def load_prompt_csv_rows(reader: Iterator[List[str]]) -> PromptMap:
+    first = next(reader, None)
+    if first is None:
         raise ValueError("Prompts CSV is empty.")
-    first = rows[0]
     has_header = False
     if first:
         c0 = first[0].strip()
         if not c0 or not c0.isdigit() or "index" in normalize_header(c0):
             has_header = True
-    data_rows = rows[1:] if has_header else rows
-    mapping: Dict[Tuple[str, int], str] = {}
+    data_rows = reader if has_header else itertools.chain([first], reader)
+    mapping: PromptMap = {}
     for row in data_rows:
         if len(row) < 4:  # Now we need at least 4 columns (index, model, prompt, summary)
             continue
@@ -50,46 +79,53 @@ def load_prompt_csv_from_text(text: str) -> Dict[Tuple[str, int], str]:
             continue
         model = row[1].strip()
         summary = row[3]  # Use summary column instead of prompt column
-        mapping[(model, idx)] = summary
+        mapping.setdefault(model, {})[idx] = summary
     return mapping
 
-def parse_pairs_txt(txt: str) -> List[Dict]:
-    pairs = []
-    for m in PAIR_PATTERN.finditer(txt):
-        pairs.append({
-            "a_model": m.group("a_model"),
-            "a_idx": int(m.group("a_idx")),
-            "b_model": m.group("b_model"),
-            "b_idx": int(m.group("b_idx")),
-        })
-    for i, p in enumerate(pairs):
-        p["pair_id"] = i
-    return pairs
+def load_prompt_csv_from_path(p: Path) -> PromptMap:
+    # Let csv pull lines straight from the file instead of decoding it into one big string first
+    with p.open("r", encoding="utf-8", errors="replace", newline="") as f:
+        return load_prompt_csv_rows(csv.reader(f))
+
+def parse_pairs_txt(txt: str) -> List[Pair]:
+    return [
+        Pair(pair_id=i, a_model=a_model, a_idx=int(a_idx), b_model=b_model, b_idx=int(b_idx))
+        for i, (a_model, a_idx, b_model, b_idx) in enumerate(
+            m.group("a_model", "a_idx", "b_model", "b_idx") for m in PAIR_PATTERN.finditer(txt)
+        )
+    ]
 
 def parse_model_index(item_str: str) -> Tuple[str, Optional[int]]:
     """Parse 'model[index]' format and return (model, index)"""
-    import re
-    match = re.match(r'([^[]+)\[(\d+)\]', item_str.strip())
+    match = _MODEL_IDX_RE.match(item_str.strip())
     if match:
         return match.group(1), int(match.group(2))
     return "", None
 
-def parse_pairs_csv(text: str) -> List[Dict]:
+def parse_pairs_csv(text: str) -> List[Pair]:
     reader = csv.DictReader(io.StringIO(text))
     if not reader.fieldnames:
         raise ValueError("Comparisons CSV missing header row.")
     header_map = {normalize_header(h): h for h in reader.fieldnames}
-    def get(row, options):
-        for k in options:
-            if k in header_map:
-                return (row.get(header_map[k]) or "").strip()
-        return ""
-    pairs: List[Dict] = []
+    def resolve(options):
+        # Pick the original column name once instead of probing every option per row
+        return next((header_map[k] for k in options if k in header_map), None)
+    def get(row, col):
+        return (row.get(col) or "").strip() if col else ""
+    col_item_a = resolve(["item_a", "itema"])
+    col_item_b = resolve(["item_b", "itemb"])
+    col_summary_a = resolve(["summary_a", "summarya"])
+    col_summary_b = resolve(["summary_b", "summaryb"])
+    col_a_model = resolve(["amodel", "a", "amodelname"])
+    col_b_model = resolve(["bmodel", "b", "bmodelname"])
+    col_a_idx = resolve(["aindex", "aidx", "a_index", "a_idx"])
+    col_b_idx = resolve(["bindex", "bidx", "b_index", "b_idx"])
+    pairs: List[Pair] = []
     
     for row in reader:
         # First try the new format with Item_A and Item_B
-        item_a = get(row, ["item_a", "itema"])
-        item_b = get(row, ["item_b", "itemb"])
+        item_a = get(row, col_item_a)
+        item_b = get(row, col_item_b)
         
         if item_a and item_b:
             # Parse model[index] format
@@ -97,106 +133,174 @@ def parse_pairs_csv(text: str) -> List[Dict]:
             b_model, b_idx = parse_model_index(item_b)
             
             # Get summaries if available
-            summary_a = get(row, ["summary_a", "summarya"])
-            summary_b = get(row, ["summary_b", "summaryb"])
+            summary_a = get(row, col_summary_a)
+            summary_b = get(row, col_summary_b)
             
             if a_model and b_model and a_idx is not None and b_idx is not None:
-                pair_data = {"a_model": a_model, "a_idx": a_idx, "b_model": b_model, "b_idx": b_idx}
-                if summary_a:
-                    pair_data["a_summary"] = summary_a
-                if summary_b:
-                    pair_data["b_summary"] = summary_b
-                pairs.append(pair_data)
+                pairs.append(Pair(
+                    pair_id=len(pairs), a_model=a_model, a_idx=a_idx, b_model=b_model, b_idx=b_idx,
+                    a_prompt=summary_a or None, b_prompt=summary_b or None,
+                ))
         else:
             # Fallback to old format
-            a_model = get(row, ["amodel", "a", "amodelname"])
-            b_model = get(row, ["bmodel", "b", "bmodelname"])
-            a_idx_s = get(row, ["aindex", "aidx", "a_index", "a_idx"])
-            b_idx_s = get(row, ["bindex", "bidx", "b_index", "b_idx"])
+            a_model = get(row, col_a_model)
+            b_model = get(row, col_b_model)
+            a_idx_s = get(row, col_a_idx)
+            b_idx_s = get(row, col_b_idx)
             if not (a_model and b_model and a_idx_s and b_idx_s):
                 continue
             try:
                 a_idx = int(a_idx_s); b_idx = int(b_idx_s)
             except Exception:
                 continue
-            pairs.append({"a_model": a_model, "a_idx": a_idx, "b_model": b_model, "b_idx": b_idx})
+            pairs.append(Pair(pair_id=len(pairs), a_model=a_model, a_idx=a_idx, b_model=b_model, b_idx=b_idx))
     
-    for i, p in enumerate(pairs):
-        p["pair_id"] = i
     return pairs
 
-def attach_prompts(pairs: List[Dict], prompt_map: Dict[Tuple[str, int], str]) -> List[Dict]:
-    out = []
+def lookup_prompt(prompt_map: PromptMap, model: str, idx: int) -> Optional[str]:
+    by_idx = prompt_map.get(model)
+    return by_idx.get(idx) if by_idx is not None else None
+
+def attach_prompts(pairs: List[Pair], prompt_map: PromptMap) -> List[Pair]:
     for p in pairs:
         # Use summaries from CSV if available, otherwise look up from prompt_map
-        a_prompt = p.get("a_summary") or prompt_map.get((p["a_model"], p["a_idx"]))
-        b_prompt = p.get("b_summary") or prompt_map.get((p["b_model"], p["b_idx"]))
-        
-        out.append({
-            **p,
-            "a_prompt": a_prompt,
-            "b_prompt": b_prompt
-        })
-    return out
+        if not p.a_prompt:
+            p.a_prompt = lookup_prompt(prompt_map, p.a_model, p.a_idx)
+        if not p.b_prompt:
+            p.b_prompt = lookup_prompt(prompt_map, p.b_model, p.b_idx)
+    return pairs
 
-def load_progress_csv(text: str) -> List[Dict]:
-    reader = csv.DictReader(io.StringIO(text))
+def load_progress_csv(text: str) -> List[Progress]:
+    reader = csv.reader(io.StringIO(text))
+    header = next(reader, None)
+    if header is None:
+        return []
+    col = {name: i for i, name in enumerate(header)}
+    def cell(row: List[str], name: str) -> str:
+        i = col.get(name)
+        return row[i].strip() if i is not None and i < len(row) else ""
     out = []
     for row in reader:
+        if not row:
+            continue
         try:
-            pid = int((row.get("pair_id") or "").strip())
+            pid = int(cell(row, "pair_id"))
         except Exception:
             pid = None
-        out.append({
-            "pair_id": pid,
-            "a_model": (row.get("a_model") or "").strip(),
-            "a_index": int((row.get("a_index") or "0").strip() or 0),
-            "b_model": (row.get("b_model") or "").strip(),
-            "b_index": int((row.get("b_index") or "0").strip() or 0),
-            "choice": (row.get("choice") or "").strip(),
-            "timestamp": (row.get("timestamp") or "").strip(),
-        })
+        out.append(Progress(
+            pair_id=pid,
+            a_model=cell(row, "a_model"),
+            a_index=int(cell(row, "a_index") or 0),
+            b_model=cell(row, "b_model"),
+            b_index=int(cell(row, "b_index") or 0),
+            choice=cell(row, "choice"),
+            timestamp=cell(row, "timestamp"),
+        ))
     return out
 
-def merge_existing_choices(pairs: List[Dict], progress: List[Dict]) -> Dict[int, Dict]:
+def merge_existing_choices(pairs: List[Pair], progress: List[Progress]) -> Dict[int, Progress]:
     by_pair_id, by_sig = {}, {}
     for r in progress:
-        sig = (r["a_model"], r["a_index"], r["b_model"], r["b_index"])
-        if r["pair_id"] is not None:
-            by_pair_id[r["pair_id"]] = r
+        sig = (r.a_model, r.a_index, r.b_model, r.b_index)
+        if r.pair_id is not None:
+            by_pair_id[r.pair_id] = r
         by_sig[sig] = r
     choices = {}
     for p in pairs:
-        sig = (p["a_model"], p["a_idx"], p["b_model"], p["b_idx"])
-        if p["pair_id"] in by_pair_id:
-            choices[p["pair_id"]] = by_pair_id[p["pair_id"]]
+        sig = (p.a_model, p.a_idx, p.b_model, p.b_idx)
+        if p.pair_id in by_pair_id:
+            choices[p.pair_id] = by_pair_id[p.pair_id]
         elif sig in by_sig:
-            choices[p["pair_id"]] = by_sig[sig]
+            choices[p.pair_id] = by_sig[sig]
     return choices
 
-def export_progress_csv(pairs: List[Dict], choices: Dict[int, Dict]) -> bytes:
-    buf = io.StringIO()
-    w = csv.writer(buf)
-    w.writerow(["pair_id","a_model","a_index","b_model","b_index","choice","timestamp","a_prompt","b_prompt"])
+_CSV_SPECIAL_CHARS = (",", '"', "\n", "\r")
+
+def _csv_field(value) -> str:
+    text = str(value)
+    # Same minimal quoting csv.writer applies: only when the field could break the row
+    if any(ch in text for ch in _CSV_SPECIAL_CHARS):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+def export_progress_csv(pairs: List[Pair], choices: Dict[int, Progress]) -> bytes:
+    lines = ["pair_id,a_model,a_index,b_model,b_index,choice,timestamp,a_prompt,b_prompt"]
     for p in pairs:
-        ch = choices.get(p["pair_id"], {})
-        w.writerow([
-            p["pair_id"], p["a_model"], p["a_idx"], p["b_model"], p["b_idx"],
-            ch.get("choice",""), ch.get("timestamp",""),
-            (p.get("a_prompt") or ""), (p.get("b_prompt") or "")
-        ])
-    return buf.getvalue().encode("utf-8")
-
-def first_unanswered_index(pairs: List[Dict], choices: Dict[int, Dict]) -> int:
+        ch = choices.get(p.pair_id)
+        lines.append(",".join([
+            str(p.pair_id), _csv_field(p.a_model), str(p.a_idx), _csv_field(p.b_model), str(p.b_idx),
+            _csv_field(ch.choice if ch else ""), _csv_field(ch.timestamp if ch else ""),
+            _csv_field(p.a_prompt or ""), _csv_field(p.b_prompt or ""),
+        ]))
+    # csv.writer's default "\r\n" terminator keeps the file byte-identical to earlier exports
+    lines.append("")
+    return "\r\n".join(lines).encode("utf-8")
+
+def is_answered(choices: Dict[int, Progress], pair_id: int) -> bool:
+    ch = choices.get(pair_id)
+    return ch is not None and bool(ch.choice)
+
+def first_unanswered_index(pairs: List[Pair], choices: Dict[int, Progress]) -> int:
     for p in pairs:
-        if p["pair_id"] not in choices or not choices[p["pair_id"]].get("choice"):
-            return p["pair_id"]
+        if not is_answered(choices, p.pair_id):
+            return p.pair_id
+    return len(pairs)
+
+def next_unanswered_index(pairs: List[Pair], choices: Dict[int, Progress], start: int) -> int:
+    """Scan forward from `start` only; everything before the cursor is already answered."""
+    for i in range(start, len(pairs)):
+        pid = pairs[i].pair_id
+        if not is_answered(choices, pid):
+            return pid
     return len(pairs)
 
-def autosave_if_enabled(pairs, choices):
-    if AUTOSAVE_PATH:
-        AUTOSAVE_PATH.parent.mkdir(parents=True, exist_ok=True)
-        AUTOSAVE_PATH.write_bytes(export_progress_csv(pairs, choices))
+@st.cache_resource(show_spinner=False, max_entries=1)
+def get_prompt_map(path_str: str, mtime_ns: int) -> PromptMap:
+    # One read-only map shared by every session; mtime_ns is only part of the cache key,
+    # so edits to the file invalidate it. Callers must not mutate the returned dict.
+    # The paths are fixed, so only the current version is kept; older maps are evicted.
+    return load_prompt_csv_from_path(Path(path_str))
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def load_pairs(comparisons_path_str: str, comparisons_mtime_ns: int,
+               prompts_path_str: str, prompts_mtime_ns: int) -> List[Pair]:
+    comparisons_path = Path(comparisons_path_str)
+    prompt_map = get_prompt_map(prompts_path_str, prompts_mtime_ns)
+
+    # Load comparisons (TXT or CSV)
+    comp_text = read_text(comparisons_path)
+    pairs: List[Pair] = []
+    if comparisons_path.suffix.lower() == ".csv":
+        try:
+            pairs = parse_pairs_csv(comp_text)
+        except Exception:
+            pairs = []
+    if not pairs:
+        pairs = parse_pairs_txt(comp_text) or parse_pairs_csv(comp_text)
+
+    return attach_prompts(pairs, prompt_map)
+
+def cached_export_bytes(pairs: List[Pair], choices: Dict[int, Progress]) -> bytes:
+    # Rebuild the CSV only after the working set was reloaded or a choice was recorded
+    key = (st.session_state.cursor_key, st.session_state.choices_version)
+    cached = st.session_state.get("export_cache")
+    if cached is None or cached[0] != key:
+        cached = (key, export_progress_csv(pairs, choices))
+        st.session_state.export_cache = cached
+    return cached[1]
+
+def autosave_if_enabled(pairs, choices, force: bool = False):
+    if not AUTOSAVE_PATH:
+        return
+    # Coalesce writes: rewriting the whole CSV on every click is O(N) per choice
+    st.session_state.autosave_counter = st.session_state.get("autosave_counter", 0) + 1
+    last_save = st.session_state.get("autosave_last", 0.0)
+    if not (force or st.session_state.autosave_counter % AUTOSAVE_EVERY == 0
+            or time.monotonic() - last_save > AUTOSAVE_INTERVAL_S):
+        return
+    AUTOSAVE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    AUTOSAVE_PATH.write_bytes(cached_export_bytes(pairs, choices))
+    st.session_state.autosave_last = time.monotonic()
 
 # -------- UI -------- #
 st.set_page_config(page_title="A/B Output Chooser", page_icon="🗂️", layout="wide")
@@ -207,6 +311,7 @@ if "pairs" not in st.session_state: st.session_state.pairs = []
 if "choices" not in st.session_state: st.session_state.choices = {}
 if "current" not in st.session_state: st.session_state.current = 0
 if "uploaded_progress_text" not in st.session_state: st.session_state.uploaded_progress_text = None
+if "choices_version" not in st.session_state: st.session_state.choices_version = 0
 
 # In-page progress upload (optional). If provided, it overrides PROGRESS_PATH.
 st.markdown("#### Continue from a progress file (optional)")
@@ -224,123 +329,130 @@ def build_or_refresh_state():
         st.error(f"Comparisons file not found: {COMPARISONS_PATH}")
         st.stop()
 
-    # Load prompts
-    prompt_map = load_prompt_csv_from_text(read_text(PROMPTS_PATH))
-
-    # Load comparisons (TXT or CSV)
-    comp_text = read_text(COMPARISONS_PATH)
-    pairs: List[Dict] = []
-    if COMPARISONS_PATH.suffix.lower() == ".csv":
-        try:
-            pairs = parse_pairs_csv(comp_text)
-        except Exception:
-            pairs = []
-    if not pairs:
-        pairs = parse_pairs_txt(comp_text) or parse_pairs_csv(comp_text)
+    # Parse prompts + comparisons only when either file changed on disk
+    data_key = (
+        str(PROMPTS_PATH), PROMPTS_PATH.stat().st_mtime_ns,
+        str(COMPARISONS_PATH), COMPARISONS_PATH.stat().st_mtime_ns,
+    )
+    if st.session_state.get("data_key") != data_key:
+        st.session_state.pairs = load_pairs(data_key[2], data_key[3], data_key[0], data_key[1])
+        st.session_state.data_key = data_key
+    pairs = st.session_state.pairs
 
     if not pairs:
         st.error("No pairs found in comparisons file.")
         st.stop()
 
-    pairs = attach_prompts(pairs, prompt_map)
-
     # Merge progress:
-    merged_from_file: Dict[int, Dict] = {}
+    merged_from_file: Dict[int, Progress] = {}
     if st.session_state.uploaded_progress_text:
         try:
             existing = load_progress_csv(st.session_state.uploaded_progress_text)
             merged_from_file = merge_existing_choices(pairs, existing)
-            st.success(f"Loaded prior progress (uploaded): {len([r for r in merged_from_file.values() if r.get('choice')])}")
+            st.success(f"Loaded prior progress (uploaded): {len([r for r in merged_from_file.values() if r.choice])}")
         except Exception as e:
             st.warning(f"Could not read uploaded progress: {e}")
     elif PROGRESS_PATH and PROGRESS_PATH.exists():
         try:
             existing = load_progress_csv(read_text(PROGRESS_PATH))
             merged_from_file = merge_existing_choices(pairs, existing)
-            st.success(f"Loaded prior progress (file): {len([r for r in merged_from_file.values() if r.get('choice')])}")
+            st.success(f"Loaded prior progress (file): {len([r for r in merged_from_file.values() if r.choice])}")
         except Exception as e:
             st.warning(f"Could not read progress file: {e}")
 
     # Keep any in-session choices (take precedence over file)
     choices = {**merged_from_file, **st.session_state.get("choices", {})}
 
-    st.session_state.pairs = pairs
     st.session_state.choices = choices
-    st.session_state.current = first_unanswered_index(pairs, choices)
+    # Full scan only when the working set changes; record_choice advances the cursor otherwise
+    cursor_key = (data_key, st.session_state.uploaded_progress_text)
+    if st.session_state.get("cursor_key") != cursor_key:
+        st.session_state.current = first_unanswered_index(pairs, choices)
+        st.session_state.completed_count = sum(1 for v in choices.values() if v.choice)
+        st.session_state.cursor_key = cursor_key
 
 # Always refresh the working set automatically (no button)
 build_or_refresh_state()
 
-pairs = st.session_state.pairs
-choices = st.session_state.choices
-current = st.session_state.current
-
 # ===== Main panel =====
-if current >= len(pairs):
-    st.success("All pairs completed. You can still download your progress.")
-else:
-    p = pairs[current]
-    # st.subheader(f"Pair {current + 1} of {len(pairs)}")
-    # c1, c2, c3 = st.columns(3)
-    # with c1: st.write(f"**A:** {p['a_model']}[{p['a_idx']}]")
-    # with c2: st.write(f"**B:** {p['b_model']}[{p['b_idx']}]")
-    # with c3: st.write(f"**Pair ID:** {p['pair_id']}")
-
-    col_a, col_b = st.columns(2)
-    with col_a:
-        st.markdown("### A")
-        if p.get("a_prompt") is None:
-            st.error(f"Prompt not found for {p['a_model']}[{p['a_idx']}] in CSV.")
-        else:
-            st.text_area("Prompt A", value=p["a_prompt"], height=280, key=f"prompt_a_{current}", label_visibility="collapsed")
-    with col_b:
-        st.markdown("### B")
-        if p.get("b_prompt") is None:
-            st.error(f"Prompt not found for {p['b_model']}[{p['b_idx']}] in CSV.")
-        else:
-            st.text_area("Prompt B", value=p["b_prompt"], height=280, key=f"prompt_b_{current}", label_visibility="collapsed")
-
-    # Only A and B buttons
-    act_cols = st.columns([1, 1])
-    def record_choice(choice_value: str):
-        choices[p["pair_id"]] = {
-            "pair_id": p["pair_id"],
-            "a_model": p["a_model"],
-            "a_index": p["a_idx"],
-            "b_model": p["b_model"],
-            "b_index": p["b_idx"],
-            "choice": choice_value,  # "A" or "B"
-            "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
-        }
-        st.session_state.choices = choices
-        st.session_state.current = first_unanswered_index(pairs, choices)
-        autosave_if_enabled(pairs, choices)
-
-    with act_cols[0]:
-        if st.button("Choose A", use_container_width=True):
-            record_choice("A"); st.rerun()
-    with act_cols[1]:
-        if st.button("Choose B", use_container_width=True):
-            record_choice("B"); st.rerun()
-
-st.markdown("---")
-st.subheader("Progress")
-completed = sum(1 for pid in range(len(pairs)) if choices.get(pid, {}).get("choice"))
-st.write(f"Completed: **{completed} / {len(pairs)}**")
-
-export_bytes = export_progress_csv(pairs, choices)
-st.download_button(
-    "Download progress CSV",
-    data=export_bytes,
-    file_name="ab_progress.csv",
-    mime="text/csv",
-)
+# Choose A/B only reruns this fragment, not the loading and progress merge above. Progress and
+# download live inside it too so the count and exported CSV never lag behind the last choice.
+@st.fragment
+def render_pair():
+    pairs = st.session_state.pairs
+    choices = st.session_state.choices
+    current = st.session_state.current
+
+    if current >= len(pairs):
+        st.success("All pairs completed. You can still download your progress.")
+    else:
+        p = pairs[current]
+        # st.subheader(f"Pair {current + 1} of {len(pairs)}")
+        # c1, c2, c3 = st.columns(3)
+        # with c1: st.write(f"**A:** {p.a_model}[{p.a_idx}]")
+        # with c2: st.write(f"**B:** {p.b_model}[{p.b_idx}]")
+        # with c3: st.write(f"**Pair ID:** {p.pair_id}")
+
+        col_a, col_b = st.columns(2)
+        with col_a:
+            st.markdown("### A")
+            if p.a_prompt is None:
+                st.error(f"Prompt not found for {p.a_model}[{p.a_idx}] in CSV.")
+            else:
+                st.text_area("Prompt A", value=p.a_prompt, height=280, key=f"prompt_a_{current}", label_visibility="collapsed")
+        with col_b:
+            st.markdown("### B")
+            if p.b_prompt is None:
+                st.error(f"Prompt not found for {p.b_model}[{p.b_idx}] in CSV.")
+            else:
+                st.text_area("Prompt B", value=p.b_prompt, height=280, key=f"prompt_b_{current}", label_visibility="collapsed")
+
+        # Only A and B buttons
+        act_cols = st.columns([1, 1])
+        def record_choice(choice_value: str):
+            if not is_answered(choices, p.pair_id):
+                st.session_state.completed_count += 1
+            choices[p.pair_id] = Progress(
+                pair_id=p.pair_id,
+                a_model=p.a_model,
+                a_index=p.a_idx,
+                b_model=p.b_model,
+                b_index=p.b_idx,
+                choice=choice_value,  # "A" or "B"
+                timestamp=datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            )
+            st.session_state.choices = choices
+            st.session_state.choices_version += 1
+            st.session_state.current = next_unanswered_index(pairs, choices, current + 1)
+            # Always flush once the last pair is answered so the final state is on disk
+            autosave_if_enabled(pairs, choices, force=st.session_state.current >= len(pairs))
+
+        # on_click runs before the fragment reruns, so the next pair renders without an extra rerun
+        with act_cols[0]:
+            st.button("Choose A", use_container_width=True, on_click=record_choice, args=("A",))
+        with act_cols[1]:
+            st.button("Choose B", use_container_width=True, on_click=record_choice, args=("B",))
+
+    st.markdown("---")
+    st.subheader("Progress")
+    completed = st.session_state.completed_count
+    st.write(f"Completed: **{completed} / {len(pairs)}**")
+
+    export_bytes = cached_export_bytes(pairs, choices)
+    st.download_button(
+        "Download progress CSV",
+        data=export_bytes,
+        file_name="ab_progress.csv",
+        mime="text/csv",
+    )
+
+render_pair()
 
 # if completed:
 #     recent = []
 #     for pid in reversed(range(len(pairs))):
-#         if choices.get(pid, {}).get("choice"):
-#             recent.append({"pair_id": pid, "choice": choices[pid]["choice"]})
+#         if is_answered(choices, pid):
+#             recent.append({"pair_id": pid, "choice": choices[pid].choice})
 #         if len(recent) >= 10:
 #             break
 #     st.caption("Recent decisions (latest 10):")
@@ -13,9 +13,19 @@ import os
 
 import streamlit as st
 
+try:
+    import orjson  # optional; stdlib json is used when it is missing
+except ImportError:
+    orjson = None
+
+try:
+    from blingfire import text_to_sentences  # optional native sentence segmenter
+except (ImportError, OSError):  # OSError: bundled x86-64 library fails to load on ARM
+    text_to_sentences = None
+
 # ---------- Configuration ----------
 INPUT_JSON = st.secrets.get("INPUT_JSON", "input_texts.json")   # list[str] or list[{"id":..., "text":...}]
-OUTPUT_JSON = st.secrets.get("OUTPUT_JSON", "annotations.json") # cumulative output file
+OUTPUT_JSON = st.secrets.get("OUTPUT_JSON", "annotations.jsonl") # cumulative output file, one JSON record per line
 CATEGORIES = json.loads(os.getenv(
     "CATEGORIES",
     '["Factual claim","Opinion","Emotion","Actionable instruction","Other"]'
@@ -24,7 +34,7 @@ ALLOW_MULTI_CATEGORY = True  # set False to allow only one category per sentence
 
 # ---------- Utilities ----------
 _SENT_SPLIT_REGEX = re.compile(
-    r"""          # very lightweight, rule-based sentence splitter
+    r"""          # fallback when blingfire is missing: lightweight, rule-based sentence splitter
     (?<!\b[A-Z])  # avoid splitting after single-letter initials
     (?<=[\.\?\!]) # end punctuation
     \s+           # whitespace after end punctuation
@@ -36,16 +46,34 @@ def split_sentences(text: str) -> List[str]:
     text = text.strip()
     if not text:
         return []
+    if text_to_sentences is not None:
+        # blingfire returns one sentence per line and handles abbreviations, quotes and ellipses
+        return [s.strip() for s in text_to_sentences(text).split("\n") if s.strip()]
     # Keep punctuation with the sentence by splitting on the following whitespace
     parts = _SENT_SPLIT_REGEX.split(text)
     # Clean and drop empties
     return [s.strip() for s in parts if s.strip()]
 
+@st.cache_data(show_spinner=False, max_entries=256)
+def sentences_for(text: str) -> List[str]:
+    # Slider drags and expander toggles rerun the script; split each text only once.
+    # Keyed on the text itself (shared across sessions), bounded so memory stays flat.
+    return split_sentences(text)
+
+def _json_loads(data: bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _json_line(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj) + b"\n"
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8") + b"\n"
+
 def load_texts(path: str) -> List[Dict[str, Any]]:
     p = Path(path)
     if not p.exists():
         return []
-    data = json.loads(p.read_text(encoding="utf-8"))
+    # orjson first, then stdlib json, same as the rating app's loader
+    data = _json_loads(p.read_bytes())
     items: List[Dict[str, Any]] = []
     if isinstance(data, list):
         for i, entry in enumerate(data):
@@ -57,18 +85,18 @@ def load_texts(path: str) -> List[Dict[str, Any]]:
 
 def append_annotation(path: str, record: Dict[str, Any]) -> None:
     p = Path(path)
-    # Persist as a JSON array (append-in-place)
+    # An older output file holds one JSON array; appending lines to it would corrupt it
     if p.exists():
-        try:
-            arr = json.loads(p.read_text(encoding="utf-8"))
-            if not isinstance(arr, list):
-                arr = []
-        except Exception:
-            arr = []
-    else:
-        arr = []
-    arr.append(record)
-    p.write_text(json.dumps(arr, ensure_ascii=False, indent=2), encoding="utf-8")
+        with p.open("rb") as f:
+            if f.read(64).lstrip()[:1] == b"[":
+                raise ValueError(
+                    f"{path} is a JSON array from an older version; point OUTPUT_JSON at a .jsonl file "
+                    "(jsonl_to_json.py merges both into one array)"
+                )
+    # Persist as JSON Lines: O(1) append instead of re-reading and rewriting the whole array.
+    # Use jsonl_to_json.py to turn the file back into a JSON array.
+    with p.open("ab") as f:
+        f.write(_json_line(record))
 
 # ---------- App State ----------
 st.set_page_config(page_title="Sentence Annotation UI", page_icon="✍️", layout="centered")
@@ -97,7 +125,7 @@ if not texts:
 
 # ---------- Current Text ----------
 current = texts[idx]
-sentences = split_sentences(current["text"])
+sentences = sentences_for(current["text"])
 
 st.subheader(f"Text {idx + 1} of {len(texts)}")
 st.write(current["text"])
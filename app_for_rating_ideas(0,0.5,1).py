@@ -1,20 +1,20 @@
-import io
+import os
 import json
+import mmap
+import bisect
 import random
-import hashlib
-from datetime import datetime
-from typing import Any, Dict, List, Tuple, Union
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
 
 import streamlit as st
 
-# -----------------------------------------------------------------------------
-# App setup
-# -----------------------------------------------------------------------------
-st.set_page_config(page_title="JSON Scoring App", layout="wide")
-st.title("JSON Scoring App: choose 0 / 0.5 / 1 per item")
-st.write("Load from `input_texts.json` or upload a saved progress file to continue.")
-st.write(
-    """Prompt:
+try:
+    import orjson  # optional: much faster encode/decode, falls back to stdlib json
+except ImportError:
+    orjson = None
+
+# Rating prompt shown above the items (module constant, not rebuilt in the render path)
+PROMPT_TEXT = """Prompt:
          
 You are a visionary researcher in quantum optics. You lead a team of scientists and want to provide ideas for them. Your team constists of theoretical quantum optics researchers who are amazing in taking your ideas and creating wonderful stand-alone proposals for experiments. The stand-alone proposals created by your team members are often published in top-journals such as Phys.Rev.Lett. (PRL). That requires that the idea is scientifically novel and concrete proposals from your ideas should be interesting for individual experts in the field or the field of quantum physics researchers as a whole.
 
@@ -29,7 +29,24 @@ Thought: (the reasoning behind the idea)
 Final idea: (the actual idea if you are happy with it)
          
 Do not add any other text. Do not output multiple Thoughts and Final ideas."""
-)
+
+# -----------------------------------------------------------------------------
+# App setup
+# -----------------------------------------------------------------------------
+st.set_page_config(page_title="JSON Scoring App", layout="wide")
+st.title("JSON Scoring App: choose 0 / 0.5 / 1 per item")
+st.write("Load from `input_texts.json` or upload a saved progress file to continue.")
+# Collapsed by default so the long prompt does not push the item below the fold
+with st.expander("Prompt", expanded=False):
+    st.markdown(PROMPT_TEXT)
+
+# One clock read per rerun, shared by every export timestamp and file name
+def _iso_utc(dt: datetime) -> str:
+    return dt.isoformat().replace("+00:00", "Z")
+
+_now = datetime.now(timezone.utc)
+_now_iso = _iso_utc(_now)
+_now_fname = _now.strftime("%Y%m%d_%H%M%S")
 
 # -----------------------------------------------------------------------------
 # Helpers
@@ -38,19 +55,68 @@ Primitive = Union[str, int, float, bool]
 Payload = Union[Primitive, List[Any], Dict[str, Any]]
 
 
+_VALID_SCORES = frozenset({0.0, 0.5, 1.0})
+# Radio options and their indices; dict lookup for the default instead of list.index
+_OPTIONS = [0.0, 0.5, 1.0]
+_OPT_IDX = {0.0: 0, 0.5: 1, 1.0: 2}
+
+
 def _is_valid_score(v: Any) -> bool:
+    # Numbers (the common case) skip float() and the exception machinery
+    if type(v) in (int, float):
+        return v in _VALID_SCORES
     try:
-        f = float(v)
-        return f in {0.0, 0.5, 1.0}
+        return float(v) in _VALID_SCORES
     except Exception:
         return False
 
+def _bump_export_version() -> None:
+    # Any change to scores, order or input invalidates the cached export bytes
+    st.session_state["_export_version"] = st.session_state.get("_export_version", 0) + 1
+
+def _mark_completed(item_id: str) -> None:
+    completed = st.session_state["_completed"]
+    if item_id in completed:
+        return
+    completed.add(item_id)
+    # Keep the cached open positions in step: drop this item's slot instead of rebuilding the list
+    cached = st.session_state.get("_visible_cache")
+    if cached is not None and cached[1] is completed:
+        j = cached[2].get(item_id)
+        open_positions = cached[3]
+        if j is not None:
+            k = bisect.bisect_left(open_positions, j)
+            if k < len(open_positions) and open_positions[k] == j:
+                del open_positions[k]
+
 def _ensure_scored(item_id: str):
-    if item_id not in st.session_state.scores or not _is_valid_score(st.session_state.scores[item_id]):
+    # Stored scores are validated on ingestion and radio values are always valid
+    if item_id not in st.session_state.scores:
         st.session_state.scores[item_id] = 0.0
+        _mark_completed(item_id)
+        _bump_export_version()
 
 def _json_dumps(obj: Any) -> bytes:
-    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    # Compact output: the export is read back by this app and score_matching.py, not by people
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    # ensure_ascii=True escapes non-ASCII text but encodes ~2x faster than ensure_ascii=False
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=True).encode("ascii")
+
+def _json_loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+
+def _load_input_json(path: str) -> Any:
+    with open(path, "rb") as f:
+        if orjson is not None:
+            # orjson parses straight from the mapped pages (page cache on reload), no read() copy
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+        # The whole document is kept in session state, so streaming would not lower peak memory
+        return _json_loads(f.read())
 
 
 def _normalize_raw(raw: Any) -> Tuple[List[str], Dict[str, float], Dict[str, Payload]]:
@@ -75,30 +141,54 @@ def _normalize_raw(raw: Any) -> Tuple[List[str], Dict[str, float], Dict[str, Pay
 
     # Case 3: list input
     if isinstance(raw, list):
+        # dict(zip(...)) builds the payload map in C instead of a second Python-level loop
         if all(isinstance(x, (str, int, float, bool)) for x in raw):
-            ids = [str(x) for x in raw]
-            payloads = {str(x): x for x in raw}
+            ids = list(map(str, raw))
+            payloads = dict(zip(ids, raw))
             return ids, {}, payloads
         else:
-            ids = [f"item_{i}" for i, _ in enumerate(raw)]
-            payloads = {f"item_{i}": raw[i] for i in range(len(raw))}
+            ids = [f"item_{i}" for i in range(len(raw))]
+            payloads = dict(zip(ids, raw))
             return ids, {}, payloads
 
     # Case 4: fallback single item
     return ["item_0"], {}, {"item_0": raw}
 
 
-def _restore_order_from_meta(raw: Any, ids: List[str]) -> List[str] | None:
+def _is_scores_only(raw: Any) -> bool:
+    # Our export format without items_payloads, i.e. the "Download scores only" file
+    if not (isinstance(raw, dict) and isinstance(raw.get("scores"), dict)):
+        return False
+    items_payloads = raw.get("items_payloads")
+    return not (isinstance(items_payloads, dict) and len(items_payloads) > 0)
+
+
+def _meta_seed(raw: Any) -> int | None:
+    meta = raw.get("meta") if isinstance(raw, dict) else None
+    seed = meta.get("seed") if isinstance(meta, dict) else None
+    return seed if isinstance(seed, int) else None
+
+
+def _restore_order_from_meta(raw: Any, ids_set: frozenset) -> List[str] | None:
     try:
         if isinstance(raw, dict) and isinstance(raw.get("meta"), dict):
             order = raw["meta"].get("order")
-            if isinstance(order, list) and set(order) == set(ids) and len(order) == len(ids):
+            if isinstance(order, list) and len(order) == len(ids_set) and set(order) == ids_set:
                 return order
     except Exception:
         pass
     return None
 
 
+def _payload_code(payload: Payload) -> str:
+    # Radio clicks rerun on the same payload object, so its indented JSON is encoded once per item
+    cached = st.session_state.get("_payload_code")
+    if cached is None or cached[0] is not payload:
+        cached = (payload, json.dumps(payload, ensure_ascii=False, indent=2))
+        st.session_state["_payload_code"] = cached
+    return cached[1]
+
+
 def _render_payload(payload: Payload) -> None:
     if isinstance(payload, (str, int, float, bool)):
         st.write(str(payload))
@@ -106,22 +196,25 @@ def _render_payload(payload: Payload) -> None:
         if all(isinstance(x, (str, int, float, bool)) for x in payload):
             st.write(" ".join(str(x) for x in payload))
         else:
-            st.code(json.dumps(payload, ensure_ascii=False, indent=2))
+            st.code(_payload_code(payload))
     elif isinstance(payload, dict):
         for key in ("text", "content", "sentence", "value"):
             if key in payload and isinstance(payload[key], (str, int, float)):
                 st.write(str(payload[key]))
                 return
-        st.code(json.dumps(payload, ensure_ascii=False, indent=2))
+        st.code(_payload_code(payload))
     else:
         st.write(str(payload))
 
 
-def _first_unscored(order: List[str], scores: Dict[str, float]) -> int:
-    for i, k in enumerate(order):
-        if k not in scores:
-            return i
-    return 0
+def _first_unscored(order: Sequence[str], scores: Dict[str, float]) -> int:
+    # Scores only grow between resets, so everything before the hint stays scored;
+    # resume the walk from there instead of from the start of the order.
+    hint = st.session_state.get("_first_unscored_hint", 0)
+    while hint < len(order) and order[hint] in scores:
+        hint += 1
+    st.session_state["_first_unscored_hint"] = hint
+    return hint if hint < len(order) else 0
 
 
 # -----------------------------------------------------------------------------
@@ -135,11 +228,11 @@ raw_data: Any = st.session_state.get("raw_data", None)
 # Default file (only if nothing in session)
 if raw_data is None:
     try:
-        with open(INPUT_JSON_PATH, "r", encoding="utf-8") as f:
-            raw_data = json.load(f)
+        raw_data = _load_input_json(INPUT_JSON_PATH)
         st.info(f"Loaded input from: {INPUT_JSON_PATH}")
         st.session_state["raw_data"] = raw_data
         st.session_state["source"] = INPUT_JSON_PATH
+        _bump_export_version()
     except FileNotFoundError:
         st.warning(f"Input file not found: {INPUT_JSON_PATH}. You can upload a progress JSON instead.")
     except Exception as e:
@@ -150,22 +243,46 @@ uploaded = st.file_uploader(
     "Upload a progress JSON to continue (optional)", type=["json"], key="resume_upload"
 )
 
+# file_id changes whenever a new file is picked, so the bytes are only read once per upload
 if uploaded is not None:
     try:
-        uploaded_bytes = uploaded.getvalue()
-        uploaded_hash = hashlib.md5(uploaded_bytes).hexdigest()
-
-        if st.session_state.get("uploaded_hash") != uploaded_hash:
-            raw = json.loads(uploaded_bytes.decode("utf-8"))
-            st.session_state["uploaded_hash"] = uploaded_hash
-            st.session_state["raw_data"] = raw
-            raw_data = raw
-
-            # Reset scores from upload; jump to next unscored once
-            st.session_state["scores"] = {}
-            st.session_state["resume_now"] = True
-            st.session_state["source"] = "uploaded progress"
-            st.success("Loaded uploaded progress JSON.")
+        if st.session_state.get("uploaded_file_id") != uploaded.file_id:
+            raw = _json_loads(uploaded.getvalue())
+            st.session_state["uploaded_file_id"] = uploaded.file_id
+            if raw_data is not None and _is_scores_only(raw):
+                # No payloads to show: keep the loaded items and order, take the scores for those items
+                loaded_ids = (
+                    st.session_state["_ids_fset"] if st.session_state.get("_ids_src") is raw_data
+                    else frozenset(_normalize_raw(raw_data)[0])
+                )
+                st.session_state["scores"] = {
+                    k: float(v) for k, v in raw["scores"].items() if k in loaded_ids and _is_valid_score(v)
+                }
+                # Resume in the file's order when it covers exactly the loaded items
+                meta_order = _restore_order_from_meta(raw, loaded_ids)
+                if meta_order is not None and "base_order" in st.session_state:
+                    st.session_state.base_order = tuple(meta_order)
+                    st.session_state["_order_seed"] = _meta_seed(raw)
+                # Force the completed set to be rebuilt from the new scores
+                st.session_state["_ids_src"] = None
+                st.session_state["_first_unscored_hint"] = 0
+                st.session_state["resume_now"] = True
+                st.session_state["source"] = "uploaded scores"
+                _bump_export_version()
+                st.success(
+                    f"Applied {len(st.session_state['scores'])} scores from the uploaded file to the loaded items."
+                )
+            else:
+                st.session_state["raw_data"] = raw
+                raw_data = raw
+
+                # Reset scores from upload; jump to next unscored once
+                st.session_state["scores"] = {}
+                st.session_state["_first_unscored_hint"] = 0
+                st.session_state["resume_now"] = True
+                st.session_state["source"] = "uploaded progress"
+                _bump_export_version()
+                st.success("Loaded uploaded progress JSON.")
         # same file on reruns -> do nothing
     except Exception as e:
         st.error(f"Could not parse uploaded JSON: {e}")
@@ -178,7 +295,15 @@ prefilled: Dict[str, float] = {}
 payloads: Dict[str, Payload] = {}
 
 if raw_data is not None:
-    ids, prefilled, payloads = _normalize_raw(raw_data)
+    # Normalize once per input object; reruns reuse the result from session state
+    normalized = st.session_state.get("_normalized")
+    if normalized is None or normalized[0] is not raw_data:
+        normalized = (raw_data, *_normalize_raw(raw_data))
+        st.session_state["_normalized"] = normalized
+        # Merge prefilled scores from file or upload once per input, not on every rerun
+        st.session_state.setdefault("scores", {}).update(normalized[2])
+        _bump_export_version()
+    _, ids, prefilled, payloads = normalized
 
 if not ids:
     st.info("No items found in input JSON.")
@@ -190,24 +315,49 @@ st.success(f"Loaded {len(ids)} items.")
 ids_all = ids
 payloads_all = payloads
 
-# Scores state
+# Scores state (prefilled scores were merged when the input was normalized)
 if "scores" not in st.session_state:
     st.session_state.scores = {}
-# Merge prefilled from file or upload
-for k, v in prefilled.items():
-    st.session_state.scores[k] = v
 
 # -----------------------------------------------------------------------------
 # Order (stable) and visibility helpers
 # -----------------------------------------------------------------------------
-def _make_base_order() -> List[str]:
-    meta_order = _restore_order_from_meta(raw_data, ids_all)
+# Per-session shuffle seed. _order_seed is the seed that produced base_order (None when the order
+# was restored from a file without one); only that is exported, so meta.seed always reproduces meta.order
+if "_seed" not in st.session_state:
+    st.session_state["_seed"] = int.from_bytes(os.urandom(8), "little")
+
+def _make_base_order() -> Tuple[str, ...]:
+    # Stored as a tuple: it is never mutated, and a tuple is cheaper to keep in session state
+    file_seed = _meta_seed(raw_data)
+    meta_order = _restore_order_from_meta(raw_data, st.session_state["_ids_fset"])
     if meta_order is not None:
-        return meta_order
-    return random.sample(ids_all, k=len(ids_all))
+        # Only a seed saved next to this order is known to have produced it
+        st.session_state["_order_seed"] = file_seed
+        return tuple(meta_order)
+    if file_seed is not None:
+        st.session_state["_seed"] = file_seed
+    st.session_state["_order_seed"] = st.session_state["_seed"]
+    return tuple(random.Random(st.session_state["_seed"]).sample(ids_all, k=len(ids_all)))
+
+# Fingerprint and set of the item ids, recomputed only when the input object changes
+if st.session_state.get("_ids_src") is not raw_data:
+    st.session_state["_ids_src"] = raw_data
+    st.session_state["_ids_fp"] = hash(tuple(ids_all))
+    st.session_state["_ids_fset"] = frozenset(ids_all)
+    # Completed ids are validated once here; _set_score/_ensure_scored keep the set current
+    st.session_state["_completed"] = {
+        k for k in st.session_state.scores
+        if k in st.session_state["_ids_fset"] and _is_valid_score(st.session_state.scores[k])
+    }
+ids_fp = st.session_state["_ids_fp"]
 
-if "base_order" not in st.session_state or set(st.session_state.base_order) != set(ids_all):
+# base_order remembers the fingerprint it was built for; an int compare per rerun
+if "base_order" not in st.session_state or st.session_state.get("ids_fp") != ids_fp:
     st.session_state.base_order = _make_base_order()
+    st.session_state.ids_fp = ids_fp
+    st.session_state["_first_unscored_hint"] = 0
+    _bump_export_version()
 
 # sticky_id keeps the currently scored item visible even if completed
 if "sticky_id" not in st.session_state:
@@ -219,34 +369,70 @@ if "hide_completed" not in st.session_state:
 st.session_state.hide_completed = True
 hide_completed = True
 
-# Compute completed set every run
-completed_keys = {k for k in st.session_state.scores if k in ids_all and _is_valid_score(st.session_state.scores[k])}
+# Maintained incrementally in session state (see the ids block above)
+completed_keys = st.session_state["_completed"]
 
 def _is_visible(item_id: str) -> bool:
     if not st.session_state.hide_completed:
         return True
     return (item_id not in completed_keys) or (item_id == st.session_state.sticky_id)
 
-def _next_visible_index(i: int) -> int:
+def _open_positions() -> Tuple[Dict[str, int], List[int]]:
+    """(id -> base_order index, sorted indices of uncompleted items), built once per order and input."""
+    # Keyed only on object identity; _mark_completed removes entries as items get scored
     base = st.session_state.base_order
-    for j in range(i + 1, len(base)):
-        if _is_visible(base[j]):
-            return j
-    return i  # no forward visible item
+    cached = st.session_state.get("_visible_cache")
+    if cached is None or cached[0] is not base or cached[1] is not completed_keys:
+        pos_of = {k: j for j, k in enumerate(base)}
+        open_positions = [j for j, k in enumerate(base) if k not in completed_keys]
+        cached = (base, completed_keys, pos_of, open_positions)
+        st.session_state["_visible_cache"] = cached
+    return cached[2], cached[3]
+
+def _sticky_position(pos_of: Dict[str, int]) -> int | None:
+    # A completed sticky item is visible but not in the open list; an uncompleted one already is
+    sticky = st.session_state.sticky_id
+    if sticky is None or sticky not in completed_keys:
+        return None
+    return pos_of.get(sticky)
+
+def _next_visible_index(i: int) -> int:
+    if not st.session_state.hide_completed:
+        return i + 1 if i + 1 < len(st.session_state.base_order) else i
+    pos_of, open_positions = _open_positions()
+    k = bisect.bisect_right(open_positions, i)
+    nxt = open_positions[k] if k < len(open_positions) else None
+    s = _sticky_position(pos_of)
+    if s is not None and s > i and (nxt is None or s < nxt):
+        nxt = s
+    return i if nxt is None else nxt  # i when no forward visible item
 
 def _prev_visible_index(i: int) -> int:
-    base = st.session_state.base_order
-    for j in range(i - 1, -1, -1):
-        if _is_visible(base[j]):
-            return j
-    return i  # no backward visible item
+    if not st.session_state.hide_completed:
+        return i - 1 if i > 0 else i
+    pos_of, open_positions = _open_positions()
+    k = bisect.bisect_left(open_positions, i) - 1
+    prv = open_positions[k] if k >= 0 else None
+    s = _sticky_position(pos_of)
+    if s is not None and s < i and (prv is None or s > prv):
+        prv = s
+    return i if prv is None else prv  # i when no backward visible item
 
 def _first_visible_index() -> int:
-    base = st.session_state.base_order
-    for j in range(len(base)):
-        if _is_visible(base[j]):
-            return j
-    return 0
+    if not st.session_state.hide_completed:
+        return 0
+    pos_of, open_positions = _open_positions()
+    first = open_positions[0] if open_positions else None
+    s = _sticky_position(pos_of)
+    if s is not None and (first is None or s < first):
+        first = s
+    return 0 if first is None else first
+
+def _any_visible() -> bool:
+    if not st.session_state.hide_completed:
+        return True
+    pos_of, open_positions = _open_positions()
+    return bool(open_positions) or _sticky_position(pos_of) is not None
 
 # Page index initialization (always in base_order coordinates)
 if ("page" not in st.session_state) or st.session_state.get("resume_now"):
@@ -256,31 +442,80 @@ if ("page" not in st.session_state) or st.session_state.get("resume_now"):
         st.session_state.page = _first_unscored(st.session_state.base_order, st.session_state.scores)
     st.session_state["resume_now"] = False
 
+def _build_export_head(exclude_id: str | None) -> Dict[str, Any]:
+    # Stored scores are already floats (_normalize_raw, _set_score, _ensure_scored), so no float() per value;
+    # membership is checked against the cached id frozenset rather than the ids_all list
+    ids_set = st.session_state["_ids_fset"]
+    # generated_at is stamped per download by _stamp_generated_at, outside the cached bytes
+    meta = {
+        "count": len(ids_all),
+        "valid_scores": [0, 0.5, 1],
+        "order": st.session_state.base_order,
+    }
+    if st.session_state.get("_order_seed") is not None:
+        meta["seed"] = st.session_state["_order_seed"]
+    return {
+        "scores": {k: v for k, v in st.session_state.scores.items() if k in ids_set and k != exclude_id},
+        "meta": meta,
+    }
+
+def _payloads_json() -> bytes:
+    """items_payloads serialized once per input; payloads never change within a session."""
+    cached = st.session_state.get("_payloads_json")
+    if cached is None or cached[0] is not raw_data:
+        cached = (raw_data, _json_dumps(payloads_all))
+        st.session_state["_payloads_json"] = cached
+    return cached[1]
+
+def _export_head_bytes(exclude_id: str | None = None) -> bytes:
+    """Scores + meta serialized, rebuilt only after scores, order or input changed."""
+    # Excluding an unscored item leaves the output unchanged, so plain navigation stays a cache hit
+    if exclude_id not in st.session_state.scores:
+        exclude_id = None
+    key = (st.session_state.get("_export_version", 0), exclude_id)
+    cached = st.session_state.get("_export_cache")
+    if cached is None or cached[0] != key:
+        cached = (key, _json_dumps(_build_export_head(exclude_id)))
+        st.session_state["_export_cache"] = cached
+    return cached[1]
+
+def _stamp_generated_at(head: bytes, generated_at: str) -> bytes:
+    # meta is the head's last key, so generated_at is appended just before its closing braces
+    return head[:-2] + b',"generated_at":' + _json_dumps(generated_at) + b"}}"
+
+def _scores_bytes(exclude_id: str | None = None) -> bytes:
+    """Scores + meta export, stamped with this rerun's time."""
+    return _stamp_generated_at(_export_head_bytes(exclude_id), _now_iso)
+
+def _full_export(exclude_id: str | None = None) -> Callable[[], bytes]:
+    """Deferred full export; the payloads are only spliced in when the button is clicked."""
+    # Runs outside the script thread, so capture the bytes now instead of reading session state
+    head = _export_head_bytes(exclude_id)
+    payloads_json = _payloads_json()
+
+    def build() -> bytes:
+        # Stamped at click time; splice the pre-serialized payloads in as the last key instead of re-encoding them
+        stamped = _stamp_generated_at(head, _iso_utc(datetime.now(timezone.utc)))
+        return stamped[:-1] + b',"items_payloads":' + payloads_json + b"}"
+
+    return build
+
 # If nothing visible, show completion state and export
-any_visible = any(_is_visible(i) for i in st.session_state.base_order)
+any_visible = _any_visible()
 if not any_visible:
     st.success("All items are completed. You can download your progress below.")
-    export = {
-        "scores": {k: float(v) for k, v in st.session_state.scores.items() if k in ids_all},
-        "meta": {
-            "generated_at": datetime.utcnow().isoformat() + "Z",
-            "count": len(ids_all),
-            "valid_scores": [0, 0.5, 1],
-            "order": st.session_state.base_order,
-        },
-        "items_payloads": payloads_all,
-    }
+    full_export = _full_export()
     st.download_button(
         label="Download progress (JSON)",
-        data=_json_dumps(export),
+        data=full_export,
         file_name="progress.json",
         mime="application/json",
         key="download_progress_all_done",
     )
-    filename = f"scores_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    filename = f"scores_{_now_fname}.json"
     st.download_button(
         label="Download JSON",
-        data=_json_dumps(export),
+        data=full_export,
         file_name=filename,
         mime="application/json",
     )
@@ -300,8 +535,8 @@ payload = payloads_all.get(current_id, current_id)
 
 # Stable position info
 total = len(st.session_state.base_order)
-position = st.session_state.base_order.index(current_id) + 1
-remaining = len([k for k in ids_all if k not in completed_keys])
+position = idx + 1  # current_id is base_order[idx] and ids are unique, so no list.index scan
+remaining = len(ids_all) - len(completed_keys)
 
 st.subheader(f"Item {position}/{total}")
 _render_payload(payload)
@@ -309,16 +544,17 @@ _render_payload(payload)
 def _set_score(item_id: str):
     val = st.session_state[f"score_{item_id}"]
     st.session_state.scores[item_id] = float(val)
+    _mark_completed(item_id)
+    _bump_export_version()
+    _first_unscored(st.session_state.base_order, st.session_state.scores)
     # Keep the current item visible so it does not disappear when hiding completed
     st.session_state.sticky_id = item_id
 
 # default selection
-options = [0.0, 0.5, 1.0]
-default_value = float(st.session_state.scores.get(current_id, 0.0))
 st.radio(
     label="Score",
-    options=options,
-    index=options.index(default_value),
+    options=_OPTIONS,
+    index=_OPT_IDX.get(st.session_state.scores.get(current_id, 0.0), 0),
     horizontal=True,
     key=f"score_{current_id}",
     on_change=_set_score,
@@ -356,20 +592,16 @@ st.markdown("---")
 # -----------------------------------------------------------------------------
 # Export (embed payloads and base order so resume shows identical content)
 # -----------------------------------------------------------------------------
-export = {
-    "scores": {k: float(v) for k, v in st.session_state.scores.items() if k in ids_all and k != current_id},
-    "meta": {
-        "generated_at": datetime.utcnow().isoformat() + "Z",
-        "count": len(ids_all),
-        "valid_scores": [0, 0.5, 1],
-        "order": st.session_state.base_order,
-    },
-    "items_payloads": payloads_all,
-}
-
+st.download_button(
+    label="Download scores only (JSON)",
+    data=_scores_bytes(exclude_id=current_id),
+    file_name=f"scores_only_{_now_fname}.json",
+    mime="application/json",
+    key="download_scores_only",
+)
 st.download_button(
     label="Download progress (JSON)",
-    data=_json_dumps(export),
+    data=_full_export(exclude_id=current_id),
     file_name="progress.json",
     mime="application/json",
     key="download_progress",
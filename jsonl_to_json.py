@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# Convert the annotation app's JSON Lines output into a single JSON array.
+# Records from the older array-format file (if present) come first, then the JSONL records.
+# The merged array is written to its own file, so neither input is overwritten.
+# Hardcode your input and output paths here:
+INPUT_JSONL = "annotations.jsonl"
+LEGACY_JSON = "annotations.json"
+OUTPUT_JSON = "annotations_merged.json"
+
+import json
+from pathlib import Path
+
+def run(input_path: str, output_path: str, legacy_path: str | None = None) -> None:
+    in_path = Path(input_path)
+    out_path = Path(output_path)
+
+    records = []
+    if legacy_path is not None and Path(legacy_path).exists():
+        records.extend(json.loads(Path(legacy_path).read_text(encoding="utf-8")))
+
+    with in_path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(records, ensure_ascii=False, indent=2), encoding="utf-8")
+
+if __name__ == "__main__":
+    run(INPUT_JSONL, OUTPUT_JSON, LEGACY_JSON)
@@ -3,16 +3,58 @@
 INPUT_JSON = "/home/priya/Downloads/scores_20250912_091506.json"
 OUTPUT_CSV = "items.csv"
 
-import json
 import csv
+import json
+from operator import itemgetter
 from pathlib import Path
 
+try:
+    import pyarrow as pa  # optional, C++ CSV writer; stdlib csv is used when it is missing
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+try:
+    import orjson  # optional, faster parsing of large score files
+except ImportError:
+    orjson = None
+
+def _cell(value) -> str:
+    # Same text csv.writer produced: None -> empty, everything else str()
+    return "" if value is None else str(value)
+
+_id_content = itemgetter("id", "content")
+
+def _payload_fields(payload) -> tuple:
+    # One C-level itemgetter call per row; only payloads missing a key pay for the .get fallback
+    try:
+        return _id_content(payload)
+    except KeyError:
+        return payload.get("id", ""), payload.get("content", "")
+
+def _write_csv(columns: dict, out_path: Path) -> None:
+    write_options = None
+    if pa is not None:
+        try:
+            # Header names are always quoted unless quoting_header="none", so only rows need the style
+            write_options = pacsv.WriteOptions(quoting_style="all_valid")
+        except TypeError:
+            pass  # pyarrow too old for quoting_style; fall back to csv below
+    if write_options is not None:
+        pacsv.write_csv(pa.table(columns), out_path, write_options=write_options)
+        return
+    # Same quoting and LF line endings as the Arrow writer, so output does not depend on the install
+    with out_path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL, lineterminator="\n")
+        writer.writerow(columns.keys())
+        writer.writerows(zip(*columns.values()))
+
 def run(input_path: str, output_path: str) -> None:
     in_path = Path(input_path)
     out_path = Path(output_path)
 
-    with in_path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    raw = in_path.read_bytes()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
     scores = data.get("scores", {})
     payloads = data.get("items_payloads", {})
@@ -20,25 +62,19 @@ def run(input_path: str, output_path: str) -> None:
 
     items = order if isinstance(order, list) else list(scores.keys())
 
-    rows = []
-    for item_key in items:
-        payload = payloads.get(item_key, {})
-        rows.append({
-            "item": item_key,
-            "id": payload.get("id", ""),
-            "content": payload.get("content", ""),
-            "score": scores.get(item_key, None),
-        })
+    # Build string columns with comprehensions and let Arrow's C++ writer emit the CSV.
+    # Rows end with LF (Arrow has no CRLF option), unlike the \r\n of the old csv.writer output.
+    # Stringifying up front keeps scores as written (no int -> float upcast, no nulls left unquoted).
+    fields = [_payload_fields(payloads.get(item_key, {})) for item_key in items]
+    columns = {
+        "item": [_cell(item_key) for item_key in items],
+        "id": [_cell(id_) for id_, _ in fields],
+        "content": [_cell(content) for _, content in fields],
+        "score": [_cell(scores.get(item_key, None)) for item_key in items],
+    }
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    with out_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=["item", "id", "content", "score"],
-            quoting=csv.QUOTE_ALL
-        )
-        writer.writeheader()
-        writer.writerows(rows)
+    _write_csv(columns, out_path)
 
 if __name__ == "__main__":
     run(INPUT_JSON, OUTPUT_CSV)